@@ -4,6 +4,8 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_login.login_manager import LoginManager
 from flask_moment import Moment
 from flask_bcrypt import Bcrypt
+from jinja2 import FileSystemBytecodeCache
+import os
 
 
 bcrypt = Bcrypt()
@@ -27,6 +29,12 @@ def create_app():
     app = Flask(__name__)
     app.config.from_object('config.Config')
 
+    # Compiled templates are kept on disk and shared by every worker and restart.
+    # Must be set before anything touches app.jinja_env.
+    os.makedirs(app.config['TEMPLATE_CACHE_DIR'], exist_ok=True)
+    app.jinja_options = {**app.jinja_options,
+                         'bytecode_cache': FileSystemBytecodeCache(app.config['TEMPLATE_CACHE_DIR'])}
+
     # Initialize extensions
     db.init_app(app)
     login_manager.init_app(app)
@@ -45,5 +53,10 @@ def create_app():
     app.register_blueprint(user_bp)
     app.register_blueprint(tag_bp)
 
+    # Profiling hooks, unless switched off
+    if app.config['PROFILING_ENABLED']:
+        from app.profiling import init_profiling
+        init_profiling(app)
+
     return app
  
\ No newline at end of file
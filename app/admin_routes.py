@@ -4,6 +4,7 @@ from flask import Blueprint, render_template, redirect, url_for, flash, request
 from flask_login import login_required, current_user, login_user
 from functools import wraps
 from app import db
+from app.jobs import enqueue
 from app.models import User, TagID
 import uuid
 
@@ -70,7 +71,7 @@ def dashboard():
     """
 
     # Retrieve the list of generated tags for the admin user
-    tags = TagID.query.all()
+    tags = TagID.query.order_by(TagID.generated_at.desc()).all()
     return render_template('admin/dashboard.html', tags=tags)
 
 
@@ -90,6 +91,9 @@ def generate_tag():
     # Create a new TagID entry in the database without associating it with any user
     new_tag = TagID(tag_id=unique_tag)
     db.session.add(new_tag)
+
+    # Render the tag's QR codes in the background worker
+    enqueue('render_tag_qr', {'tag_id': unique_tag})
     db.session.commit()
 
     flash(f'Tag generated successfully: {unique_tag}', 'success')
@@ -0,0 +1,290 @@
+# app/jobs.py
+import os
+import signal
+import socket
+import threading
+import time
+import traceback
+import uuid
+from datetime import datetime, timedelta, timezone
+from contextlib import contextmanager
+from itertools import groupby
+
+from flask import current_app
+from sqlalchemy import and_, or_, update
+from app import db
+from app.models import Job
+from app.qr_codes import QR_MIMETYPES, render_qr, tag_url
+
+# Registered handlers: kind -> (function, batch)
+_handlers = {}
+
+
+def job_handler(kind, batch=False):
+    """
+    Register a function as the handler for a kind of job.
+
+    Handlers must be idempotent: a job is run again after a timeout or a crash of its
+    worker, and a handler stuck in C code cannot be interrupted by JOB_TIMEOUT, so it
+    may be reclaimed by another worker while it is still running.
+
+    Parameters:
+    - kind (str): Job kind the handler runs.
+    - batch (bool): If True, the handler receives the payloads of all claimed jobs of
+      this kind as one list; otherwise it is called once per payload.
+
+    Returns:
+    - function: Decorator that registers the handler and returns it unchanged.
+    """
+    def decorator(func):
+        _handlers[kind] = (func, batch)
+        return func
+    return decorator
+
+
+def utcnow():
+    """
+    Get the current time as a naive UTC datetime, as stored in the job table.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def enqueue(kind, payload=None, delay=0, max_attempts=5):
+    """
+    Add a job to the current session.
+
+    The job is committed together with the caller's own changes, so work is never
+    queued for data that was rolled back.
+
+    Parameters:
+    - kind (str): Job kind; must have a registered handler.
+    - payload (dict): JSON arguments for the handler.
+    - delay (int): Seconds to wait before the job may run.
+    - max_attempts (int): Number of attempts before the job is marked as failed.
+
+    Returns:
+    - Job: The new job.
+    """
+    job = Job(kind=kind, payload=payload or {}, status='queued', attempts=0,
+              max_attempts=max_attempts, run_at=utcnow() + timedelta(seconds=delay))
+    db.session.add(job)
+    return job
+
+
+def runnable_jobs_query(now, batch_size, lock_timeout):
+    """
+    Build the statement that selects the IDs of jobs a worker may claim.
+
+    Runnable jobs are queued jobs that are due, plus jobs left running for longer than
+    lock_timeout (e.g. by a crashed worker) that have attempts left. Rows are locked with FOR UPDATE SKIP LOCKED
+    on MySQL/MariaDB; SQLite has no row locks and compiles the clause away.
+
+    Parameters:
+    - now (datetime): Current time (naive UTC).
+    - batch_size (int): Maximum number of jobs to select.
+    - lock_timeout (int): Seconds after which a running job is considered abandoned.
+
+    Returns:
+    - Select: Statement selecting job IDs, oldest first.
+    """
+    return (db.select(Job.job_id).where(runnable(now, lock_timeout)).order_by(Job.run_at)
+            .limit(batch_size).with_for_update(skip_locked=True))
+
+
+def runnable(now, lock_timeout):
+    """
+    Build the condition matching jobs that may be claimed at the given time.
+
+    Parameters:
+    - now (datetime): Current time (naive UTC).
+    - lock_timeout (int): Seconds after which a running job is considered abandoned.
+
+    Returns:
+    - ColumnElement: Condition on the job table.
+    """
+    return or_(and_(Job.status == 'queued', Job.run_at <= now),
+               and_(abandoned(now, lock_timeout), Job.attempts < Job.max_attempts))
+
+
+def abandoned(now, lock_timeout):
+    """
+    Build the condition matching running jobs whose lock has expired.
+
+    Parameters:
+    - now (datetime): Current time (naive UTC).
+    - lock_timeout (int): Seconds after which a running job is considered abandoned.
+
+    Returns:
+    - ColumnElement: Condition on the job table.
+    """
+    return and_(Job.status == 'running', Job.locked_at < now - timedelta(seconds=lock_timeout))
+
+
+def claim_jobs(batch_size, lock_timeout):
+    """
+    Claim up to batch_size runnable jobs for this worker.
+
+    On MySQL/MariaDB candidates are selected with SELECT ... FOR UPDATE SKIP LOCKED so
+    concurrent workers never wait on each other. SQLite has no row locks, so the claim
+    relies on the conditional UPDATE instead: a job taken by another worker in the
+    meantime no longer matches and is simply not claimed.
+
+    Claiming a job counts as an attempt, so a job that keeps killing its worker (out of
+    memory, hang) is retried at most max_attempts times. Jobs left running for longer
+    than lock_timeout are reclaimed if they have attempts left and marked as failed otherwise.
+
+    Parameters:
+    - batch_size (int): Maximum number of jobs to claim.
+    - lock_timeout (int): Seconds after which a running job is considered abandoned.
+
+    Returns:
+    - list: Claimed jobs, oldest first.
+    """
+    now = utcnow()
+    token = f'{socket.gethostname()[:40]}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+
+    db.session.execute(update(Job).where(abandoned(now, lock_timeout), Job.attempts >= Job.max_attempts)
+                       .values(status='failed', locked_by=None, locked_at=None, finished_at=now,
+                               last_error='Worker lost: the job was still running after the lock timeout.'))
+
+    job_ids = list(db.session.scalars(runnable_jobs_query(now, batch_size, lock_timeout)))
+    if job_ids:
+        db.session.execute(update(Job).where(Job.job_id.in_(job_ids), runnable(now, lock_timeout))
+                           .values(status='running', attempts=Job.attempts + 1, locked_by=token, locked_at=now))
+    db.session.commit()
+
+    return list(db.session.scalars(db.select(Job).where(Job.locked_by == token).order_by(Job.run_at)))
+
+
+def run_jobs(jobs):
+    """
+    Run claimed jobs, batching jobs of the same kind when their handler allows it.
+
+    Successful jobs are marked as done. Failed jobs, including handlers interrupted after
+    JOB_TIMEOUT seconds, are retried with exponential backoff
+    (JOB_RETRY_BACKOFF * 2 ** (attempts - 1) seconds) until max_attempts is reached.
+    Each job records its run time (batched jobs share the batch's run time equally)
+    and logs how long it waited after becoming runnable.
+
+    The lock of each chunk is renewed before it runs, so a long queue of claimed jobs
+    does not expire behind a slow one; jobs reclaimed by another worker meanwhile are skipped.
+
+    Parameters:
+    - jobs (list): Jobs returned by claim_jobs().
+
+    Returns:
+    - list: Finished jobs.
+    """
+    backoff = current_app.config['JOB_RETRY_BACKOFF']
+    timeout = current_app.config['JOB_TIMEOUT']
+    tokens = {job.job_id: job.locked_by for job in jobs}
+    finished = []
+
+    for kind, group in groupby(sorted(jobs, key=lambda job: job.kind), key=lambda job: job.kind):
+        group = list(group)
+        func, batch = _handlers.get(kind, (None, False))
+        chunks = [group] if batch else [[job] for job in group]
+
+        for chunk in chunks:
+            token = tokens[chunk[0].job_id]
+            db.session.execute(update(Job).where(Job.job_id.in_([job.job_id for job in chunk]),
+                                                 Job.locked_by == token).values(locked_at=utcnow()))
+            db.session.commit()
+            chunk = [job for job in chunk if job.locked_by == token]
+            if not chunk:
+                continue
+
+            started_at = utcnow()
+            started = time.perf_counter()
+            error = None
+            try:
+                if func is None:
+                    raise LookupError(f'No handler registered for job kind {kind!r}.')
+                with time_limit(timeout):
+                    if batch:
+                        func([job.payload for job in chunk])
+                    else:
+                        func(chunk[0].payload)
+            except Exception:
+                db.session.rollback()
+                error = traceback.format_exc()
+            duration_ms = (time.perf_counter() - started) * 1000 / len(chunk)
+
+            for job in chunk:
+                wait_ms = (started_at - job.run_at).total_seconds() * 1000
+                job.started_at = started_at
+                job.finished_at = utcnow()
+                job.duration_ms = duration_ms
+                job.locked_by = None
+                job.locked_at = None
+                job.last_error = error
+                if error is None:
+                    job.status = 'done'
+                elif job.attempts >= job.max_attempts:
+                    job.status = 'failed'
+                else:
+                    job.status = 'queued'
+                    job.run_at = utcnow() + timedelta(seconds=backoff * 2 ** (job.attempts - 1))
+
+                current_app.logger.info('job %s kind=%s status=%s attempt=%d run_ms=%.1f wait_ms=%.0f',
+                                        job.job_id, job.kind, job.status, job.attempts, job.duration_ms, wait_ms)
+            db.session.commit()
+            finished.extend(chunk)
+
+    return finished
+
+
+@contextmanager
+def time_limit(seconds):
+    """
+    Raise TimeoutError in the block if it runs for longer than the given time.
+
+    Uses SIGALRM, so the limit only applies in the main thread on Unix (as in
+    `flask run-worker`) and only between Python bytecodes; elsewhere the block is not limited.
+
+    Parameters:
+    - seconds (float): Time limit; 0 or None disables it.
+    """
+    if not seconds or not hasattr(signal, 'setitimer') or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def expire(signum, frame):
+        raise TimeoutError(f'Job ran for longer than {seconds} seconds.')
+
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def work(once=False):
+    """
+    Claim and run jobs until interrupted.
+
+    Parameters:
+    - once (bool): If True, stop as soon as no runnable jobs are left.
+    """
+    config = current_app.config
+    while True:
+        jobs = claim_jobs(config['JOB_BATCH_SIZE'], config['JOB_LOCK_TIMEOUT'])
+        if jobs:
+            run_jobs(jobs)
+        elif once:
+            return
+        else:
+            time.sleep(config['JOB_POLL_INTERVAL'])
+
+
+# Job handlers
+
+@job_handler('render_tag_qr', batch=True)
+def render_tag_qr(payloads):
+    # Pre-render the QR codes of new tags so the first scan is served from the cache
+    for payload in payloads:
+        url = tag_url(current_app.config['TAG_BASE_URL'], payload['tag_id'])
+        for fmt in QR_MIMETYPES:
+            render_qr(url, fmt, current_app.config['QR_CACHE_DIR'])
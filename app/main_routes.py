@@ -1,5 +1,5 @@
 # app/routes/main_routes.py
-from flask import Blueprint, render_template, abort
+from flask import Blueprint, render_template, abort, current_app, send_from_directory
 
 main_bp = Blueprint('main', __name__)
 
@@ -13,6 +13,16 @@ def home():
     return render_template('main/index.html')
 
 
+@main_bp.route('/sw.js')
+def service_worker():
+    """
+    Serve the service worker from the site root so its scope covers the contact cards.
+
+    Always revalidated, so a new service worker is picked up on the next visit.
+    """
+    return send_from_directory(current_app.static_folder, 'js/sw.js', mimetype='text/javascript', max_age=0)
+
+
 @main_bp.route('/', defaults={'path': ''})
 @main_bp.route('/<path:path>')
 def catch_all(path):
@@ -47,7 +47,6 @@ class User(BaseModel, UserMixin):
     - contact_details (ContactDetails): One-to-one relationship with ContactDetails model.
     """
     __tablename__ = 'user'
-    __table_args__ = (db.UniqueConstraint('user_id', 'email', 'username', name='unique_user_email'),)
 
     user_id = db.Column(db.Integer, primary_key=True)
     first_name = db.Column(db.String(255))
@@ -169,7 +168,62 @@ class TagID(BaseModel):
     """
     tag_id = db.Column(db.String(36), primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.user_id'), unique=True)
-    generated_at = db.Column(db.TIMESTAMP, default=db.func.current_timestamp())
+    generated_at = db.Column(db.TIMESTAMP, default=db.func.current_timestamp(), index=True)
+
+
+class Job(BaseModel):
+    """
+    Job model to represent deferred work for the background worker.
+
+    Attributes:
+    - job_id (int): Job's unique identifier.
+    - kind (str): Name of the registered handler that runs the job.
+    - payload (dict): JSON arguments passed to the handler.
+    - status (str): Job's status ('queued', 'running', 'done' or 'failed', default is 'queued').
+    - attempts (int): Number of times the job has been claimed by a worker.
+    - max_attempts (int): Number of attempts before the job is marked as failed.
+    - run_at (datetime): Earliest time the job may run (UTC).
+    - locked_by (str): Claim token of the worker running the job.
+    - locked_at (datetime): Timestamp of when the job was claimed (UTC).
+    - started_at (datetime): Timestamp of when the last attempt started (UTC).
+    - finished_at (datetime): Timestamp of when the last attempt finished (UTC).
+    - duration_ms (float): Run time of the last attempt in milliseconds.
+    - last_error (str): Error raised by the last failed attempt.
+    """
+    __table_args__ = (db.Index('ix_job_status_run_at', 'status', 'run_at'),)
+
+    job_id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(100), nullable=False)
+    payload = db.Column(db.JSON)
+    status = db.Column(db.String(20), default='queued', nullable=False)
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    max_attempts = db.Column(db.Integer, default=5, nullable=False)
+    run_at = db.Column(DateTime, nullable=False)
+    locked_by = db.Column(db.String(64), index=True)
+    locked_at = db.Column(DateTime)
+    started_at = db.Column(DateTime)
+    finished_at = db.Column(DateTime)
+    duration_ms = db.Column(db.Float)
+    last_error = db.Column(db.Text)
+
+    @validates('status')
+    def validate_status(self, key, status):
+        """
+        Validate the job's status.
+
+        Parameters:
+        - key (str): Column name ('status').
+        - status (str): Job's status.
+
+        Returns:
+        - str: Validated job status.
+
+        Raises:
+        - ValueError: If an invalid status is provided.
+        """
+        if status not in ['queued', 'running', 'done', 'failed']:
+            raise ValueError("Invalid status. Must be 'queued', 'running', 'done' or 'failed'.")
+        return status
 
 
 class AnonymousUser(AnonymousUserMixin):
@@ -0,0 +1,108 @@
+# app/ndef.py
+import json
+from urllib.parse import urlsplit, urlunsplit
+
+# NFC Forum URI Record Type Definition identifier codes, longest prefix first
+URI_PREFIXES = [
+    (b'\x02', 'https://www.'),
+    (b'\x01', 'http://www.'),
+    (b'\x04', 'https://'),
+    (b'\x03', 'http://'),
+]
+
+# MB | ME | SR | TNF=0x01 (NFC Forum well-known type)
+SHORT_RECORD_HEADER = 0xD1
+URI_RECORD_TYPE = b'U'
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def shortest_url(url):
+    """
+    Normalise a URL to its shortest equivalent form.
+
+    Lowercases the scheme and host and drops a default port and any empty query or
+    fragment. User info and bracketed IPv6 hosts are kept as they are.
+
+    Parameters:
+    - url (str): URL to normalise.
+
+    Returns:
+    - str: Equivalent URL with as few characters as possible.
+
+    Raises:
+    - ValueError: If the URL has an invalid port.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+
+    userinfo, at, hostport = parts.netloc.rpartition('@')
+    host, port = hostport, ''
+    # The last colon only separates a port if it is not inside an IPv6 literal ("[::1]")
+    if ':' in hostport and not hostport.endswith(']'):
+        host, _, port = hostport.rpartition(':')
+    if port and not port.isdigit():
+        raise ValueError(f'Invalid port in URL {url!r}.')
+    if port and int(port) == DEFAULT_PORTS.get(scheme):
+        port = ''
+
+    netloc = userinfo + at + host.lower() + (f':{port}' if port else '')
+    return urlunsplit((scheme, netloc, parts.path, parts.query, parts.fragment))
+
+
+def encode_uri_record(url):
+    """
+    Encode a URL as a single-record NDEF message.
+
+    The scheme (and "www.") is replaced by its one-byte URI identifier code.
+
+    Parameters:
+    - url (str): URL to encode.
+
+    Returns:
+    - bytes: NDEF message containing one short URI record.
+
+    Raises:
+    - ValueError: If the URL does not fit in a short record (255 byte payload).
+    """
+    url = shortest_url(url)
+    code, rest = b'\x00', url
+    for prefix_code, prefix in URI_PREFIXES:
+        if url.startswith(prefix):
+            code, rest = prefix_code, url[len(prefix):]
+            break
+
+    payload = code + rest.encode('utf-8')
+    if len(payload) > 255:
+        raise ValueError('URL is too long for a short NDEF record.')
+
+    return bytes([SHORT_RECORD_HEADER, len(URI_RECORD_TYPE), len(payload)]) + URI_RECORD_TYPE + payload
+
+
+def write_ndef_batch(tags, path):
+    """
+    Write NDEF messages for a batch of tags as a fixed-stride binary file plus an index.
+
+    Record i starts at byte i * stride of the binary file and is zero-padded to the
+    stride, so encoder software can memory-map the file and stream records in order.
+    The index (path + '.json') lists the stride and each record's tag ID, offset and length.
+
+    Parameters:
+    - tags (list): (tag_id, url) pairs, in write order.
+    - path (str): Path of the binary file; the index is written next to it.
+
+    Returns:
+    - dict: The index that was written.
+    """
+    messages = [(tag_id, encode_uri_record(url)) for tag_id, url in tags]
+    stride = max((len(message) for _, message in messages), default=0)
+
+    records = []
+    with open(path, 'wb') as f:
+        for position, (tag_id, message) in enumerate(messages):
+            f.write(message.ljust(stride, b'\x00'))
+            records.append({'tag_id': tag_id, 'offset': position * stride, 'length': len(message)})
+
+    index = {'stride': stride, 'count': len(records), 'records': records}
+    with open(path + '.json', 'w') as f:
+        json.dump(index, f, indent=1)
+    return index
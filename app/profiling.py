@@ -0,0 +1,187 @@
+# app/profiling.py
+import collections
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from flask import g, has_app_context, request
+from flask_login import current_user
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class Profile:
+    """
+    Stack samples and SQL timings collected for one request.
+
+    Attributes:
+    - profile_id (str): Profile's unique identifier, returned in the X-Profile-Id header.
+    - stacks (Counter): Number of samples per collapsed stack.
+    - queries (list): (duration_ms, statement) for every SQL statement executed.
+    - started (float): perf_counter() value when profiling started.
+    """
+
+    def __init__(self, thread_id, interval):
+        self.profile_id = uuid.uuid4().hex[:12]
+        self.stacks = collections.Counter()
+        self.queries = []
+        self.started = time.perf_counter()
+        self._thread_id = thread_id
+        self._interval = interval
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._sample, daemon=True)
+        self._sampler.start()
+
+    def _sample(self):
+        # Runs in its own thread; the profiled thread is never interrupted
+        while not self._stop.wait(self._interval):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is not None:
+                self.stacks[collapse(frame)] += 1
+
+    def stop(self):
+        """
+        Stop sampling and wait for the sampler thread to exit.
+
+        Returns:
+        - float: Profiled time in milliseconds.
+        """
+        self._stop.set()
+        self._sampler.join()
+        return (time.perf_counter() - self.started) * 1000
+
+
+def collapse(frame):
+    """
+    Collapse a stack into the 'outer;...;inner' form read by flamegraph tools.
+
+    Parameters:
+    - frame (frame): Innermost frame of the stack.
+
+    Returns:
+    - str: One 'module:function' entry per frame, outermost first.
+    """
+    names = []
+    while frame is not None:
+        names.append(f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_name}")
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+def prune_profiles(profile_dir, max_profiles):
+    """
+    Delete the oldest profiles so that at most max_profiles are kept.
+
+    Parameters:
+    - profile_dir (str): Directory the profiles are written to.
+    - max_profiles (int): Number of profiles to keep.
+    """
+    profiles = []
+    for entry in os.scandir(profile_dir):
+        if entry.name.endswith('.collapsed'):
+            try:
+                profiles.append((entry.stat().st_mtime, entry.name[:-len('.collapsed')]))
+            except FileNotFoundError:
+                # Another worker pruned it first
+                pass
+    profiles.sort()
+
+    for _, name in profiles[:max(len(profiles) - max_profiles, 0)]:
+        for suffix in ('.collapsed', '.sql.txt'):
+            try:
+                os.remove(os.path.join(profile_dir, name + suffix))
+            except FileNotFoundError:
+                pass
+
+
+def init_profiling(app):
+    """
+    Register the request hooks and SQL timers of the sampling profiler.
+
+    Registered unless PROFILING_ENABLED is switched off. A request is profiled if it is
+    sampled (PROFILE_SAMPLE_RATE, 0 by default) or if an admin asks for it with an
+    'X-Profile: 1' header or a '?_profile=1' query flag, so any request can be profiled
+    without a restart. Requests that are not profiled cost one header and one query
+    argument lookup.
+
+    For each profiled request, PROFILE_DIR receives:
+    - <time>-<endpoint>-<id>.collapsed: stack sample counts, ready for flamegraph.pl or speedscope.
+    - <time>-<endpoint>-<id>.sql.txt: request duration and the timing of every SQL statement.
+    Only the newest PROFILE_MAX_PROFILES profiles are kept.
+
+    Parameters:
+    - app (Flask): Application to profile.
+    """
+    sample_rate = app.config['PROFILE_SAMPLE_RATE']
+    interval = app.config['PROFILE_INTERVAL']
+    profile_dir = app.config['PROFILE_DIR']
+    max_profiles = app.config['PROFILE_MAX_PROFILES']
+
+    def requested_by_admin():
+        # Same check as admin_required; the flag is ignored for everyone else
+        flagged = request.headers.get('X-Profile') == '1' or request.args.get('_profile') == '1'
+        return flagged and current_user.is_authenticated and current_user.is_admin()
+
+    @app.before_request
+    def start_profile():
+        if (sample_rate and random.random() < sample_rate) or requested_by_admin():
+            g._profile = Profile(threading.get_ident(), interval)
+
+    @app.after_request
+    def add_profile_header(response):
+        profile = g.get('_profile')
+        if profile is not None:
+            response.headers['X-Profile-Id'] = profile.profile_id
+        return response
+
+    @app.teardown_request
+    def dump_profile(exc):
+        profile = g.pop('_profile', None)
+        if profile is None:
+            return
+        duration_ms = profile.stop()
+
+        os.makedirs(profile_dir, exist_ok=True)
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{request.endpoint or 'unknown'}-{profile.profile_id}"
+        with open(os.path.join(profile_dir, name + '.collapsed'), 'w') as f:
+            for stack, count in profile.stacks.most_common():
+                f.write(f'{stack} {count}\n')
+
+        sql_ms = sum(duration for duration, _ in profile.queries)
+        with open(os.path.join(profile_dir, name + '.sql.txt'), 'w') as f:
+            f.write(f'{request.method} {request.full_path} -> {request.endpoint}\n')
+            f.write(f'request {duration_ms:.1f} ms, {len(profile.queries)} queries {sql_ms:.1f} ms, '
+                    f'{sum(profile.stacks.values())} samples every {interval * 1000:g} ms\n\n')
+            for duration, statement in profile.queries:
+                f.write(f'{duration:8.2f} ms  {" ".join(statement.split())}\n')
+
+        prune_profiles(profile_dir, max_profiles)
+
+    # Engine-wide listeners, registered once however many apps are created
+    if not event.contains(Engine, 'before_cursor_execute', start_query_timer):
+        event.listen(Engine, 'before_cursor_execute', start_query_timer)
+        event.listen(Engine, 'after_cursor_execute', stop_query_timer)
+
+
+def current_profile():
+    """
+    Get the profile of the current request, if it is being profiled.
+
+    Returns:
+    - Profile: The active profile, or None.
+    """
+    return g.get('_profile') if has_app_context() else None
+
+
+def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    if current_profile() is not None:
+        conn.info.setdefault('_profile_query_start', []).append(time.perf_counter())
+
+
+def stop_query_timer(conn, cursor, statement, parameters, context, executemany):
+    profile = current_profile()
+    if profile is not None and conn.info.get('_profile_query_start'):
+        started = conn.info['_profile_query_start'].pop()
+        profile.queries.append(((time.perf_counter() - started) * 1000, statement))
@@ -0,0 +1,159 @@
+# app/qr_codes.py
+import hashlib
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+# qrcode and Pillow are imported where they are used: web workers serve most codes
+# straight from the cache and never need them
+
+# Bump when rendering parameters change so old cache entries are no longer addressed
+RENDER_VERSION = 1
+
+QR_MIMETYPES = {'svg': 'image/svg+xml', 'png': 'image/png'}
+
+# A4 portrait at 300 dpi
+SHEET_SIZE = (2480, 3508)
+SHEET_DPI = 300
+SHEET_COLUMNS = 4
+SHEET_ROWS = 6
+SHEET_MARGIN = 120
+LABEL_HEIGHT = 60
+
+
+def tag_url(base_url, tag_id):
+    """
+    Build the public URL a tag points at.
+
+    Parameters:
+    - base_url (str): Public tag URL prefix (TAG_BASE_URL).
+    - tag_id (str): Tag's UUID.
+
+    Returns:
+    - str: URL encoded into the NFC tag and QR code.
+    """
+    return base_url.rstrip('/') + '/' + tag_id
+
+
+def cached_qr_path(data, fmt, cache_dir):
+    """
+    Get the cache path for a QR code, addressed by the hash of what it encodes.
+
+    Parameters:
+    - data (str): Data encoded in the QR code.
+    - fmt (str): Image format ('svg' or 'png').
+    - cache_dir (str): Root of the render cache.
+
+    Returns:
+    - str: Path of the cached image (which may not exist yet).
+    """
+    key = hashlib.sha256(f'{RENDER_VERSION}:{fmt}:{data}'.encode('utf-8')).hexdigest()
+    return os.path.join(cache_dir, key[:2], f'{key}.{fmt}')
+
+
+def render_qr(data, fmt, cache_dir):
+    """
+    Render a QR code once and return its cached file.
+
+    The image is written to a temporary file and moved into place, so concurrent
+    workers never serve a partially written code.
+
+    Parameters:
+    - data (str): Data encoded in the QR code.
+    - fmt (str): Image format ('svg' or 'png').
+    - cache_dir (str): Root of the render cache.
+
+    Returns:
+    - str: Path of the cached image.
+
+    Raises:
+    - ValueError: If an unsupported format is requested.
+    """
+    if fmt not in QR_MIMETYPES:
+        raise ValueError("Invalid format. Must be 'svg' or 'png'.")
+
+    path = cached_qr_path(data, fmt, cache_dir)
+    if os.path.exists(path):
+        return path
+
+    import qrcode
+    from qrcode.image.svg import SvgPathImage
+
+    qr = qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_M, box_size=10, border=4)
+    qr.add_data(data)
+    qr.make(fit=True)
+    image = qr.make_image(image_factory=SvgPathImage) if fmt == 'svg' else qr.make_image()
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            image.save(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return path
+
+
+def render_sheet(page_number, tags, base_url, output_dir, cache_dir):
+    """
+    Render one print sheet of QR codes, each labelled with its tag ID.
+
+    Parameters:
+    - page_number (int): 1-based page number, used in the file name.
+    - tags (list): Tag IDs to place on this sheet, at most SHEET_COLUMNS * SHEET_ROWS.
+    - base_url (str): Public tag URL prefix (TAG_BASE_URL).
+    - output_dir (str): Directory the sheet is written to.
+    - cache_dir (str): Root of the render cache.
+
+    Returns:
+    - str: Path of the rendered sheet.
+    """
+    from PIL import Image, ImageDraw, ImageFont
+
+    sheet = Image.new('L', SHEET_SIZE, 255)
+    draw = ImageDraw.Draw(sheet)
+    font = ImageFont.load_default(size=24)
+
+    cell_width = (SHEET_SIZE[0] - 2 * SHEET_MARGIN) // SHEET_COLUMNS
+    cell_height = (SHEET_SIZE[1] - 2 * SHEET_MARGIN) // SHEET_ROWS
+    code_size = min(cell_width, cell_height - LABEL_HEIGHT) - 40
+
+    for index, tag_id in enumerate(tags):
+        left = SHEET_MARGIN + (index % SHEET_COLUMNS) * cell_width
+        top = SHEET_MARGIN + (index // SHEET_COLUMNS) * cell_height
+
+        with Image.open(render_qr(tag_url(base_url, tag_id), 'png', cache_dir)) as code:
+            code = code.convert('L').resize((code_size, code_size), Image.NEAREST)
+        sheet.paste(code, (left + (cell_width - code_size) // 2, top))
+        draw.text((left + cell_width // 2, top + code_size + LABEL_HEIGHT // 2), tag_id,
+                  fill=0, font=font, anchor='mm')
+
+    path = os.path.join(output_dir, f'sheet-{page_number:05d}.png')
+    sheet.save(path, dpi=(SHEET_DPI, SHEET_DPI))
+    return path
+
+
+def render_sheets(tag_ids, base_url, output_dir, cache_dir, processes=None):
+    """
+    Render tags into paginated print sheets across a process pool.
+
+    Parameters:
+    - tag_ids (list): Tag IDs to print, in order.
+    - base_url (str): Public tag URL prefix (TAG_BASE_URL).
+    - output_dir (str): Directory the sheets are written to.
+    - cache_dir (str): Root of the render cache.
+    - processes (int): Number of worker processes (default is the CPU count).
+
+    Returns:
+    - list: Paths of the rendered sheets, in page order.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    per_page = SHEET_COLUMNS * SHEET_ROWS
+    pages = [tag_ids[i:i + per_page] for i in range(0, len(tag_ids), per_page)]
+
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = [executor.submit(render_sheet, number, page, base_url, output_dir, cache_dir)
+                   for number, page in enumerate(pages, start=1)]
+        return [future.result() for future in futures]
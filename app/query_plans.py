@@ -0,0 +1,120 @@
+# app/query_plans.py
+from datetime import datetime
+from sqlalchemy import text
+from app import db
+from app.jobs import runnable_jobs_query
+from app.models import User, TagID, ContactDetails
+
+
+# Hot queries issued by the route handlers and the job worker, as
+# (name, statement, full_scan_allowed, sort_allowed).
+# The admin tag list reads every row by design, but must read them in ix_tag_id_generated_at
+# order rather than sort them. The claim query merges its two index branches with a sort
+# (bounded by the batch size). Everything else must hit an index without sorting.
+HOT_QUERIES = [
+    ('tag.handle_tag: tag by uuid',
+     db.select(TagID).filter_by(tag_id='00000000-0000-0000-0000-000000000000'), False, False),
+    ('user.contact_details: user by id',
+     db.select(User).filter_by(user_id=1), False, False),
+    ('user.contact_details: contact details by user',
+     db.select(ContactDetails).filter_by(user_id=1), False, False),
+    ('user.login: tag by user',
+     db.select(TagID).filter_by(user_id=1), False, False),
+    ('user.login: user by username',
+     db.select(User).filter_by(username='username'), False, False),
+    ('user.signup_form: user by email',
+     db.select(User).filter_by(email='user@example.com'), False, False),
+    ('worker: claim runnable jobs',
+     runnable_jobs_query(datetime(2000, 1, 1), batch_size=20, lock_timeout=600), False, True),
+    ('admin.dashboard: tags newest first',
+     db.select(TagID).order_by(TagID.generated_at.desc()), True, False),
+]
+
+
+def explain(statement):
+    """
+    Run the dialect's EXPLAIN for a statement against the configured database.
+
+    Parameters:
+    - statement (Select): SQLAlchemy statement to explain.
+
+    Returns:
+    - list: One (table, access, detail) tuple per plan step.
+
+    Raises:
+    - NotImplementedError: If the database dialect is not SQLite or MySQL/MariaDB.
+    """
+    dialect = db.engine.dialect
+    sql = str(statement.compile(dialect=dialect, compile_kwargs={'literal_binds': True}))
+
+    if dialect.name == 'sqlite':
+        rows = db.session.execute(text('EXPLAIN QUERY PLAN ' + sql)).mappings()
+        return [sqlite_step(row['detail']) for row in rows]
+
+    if dialect.name in ('mysql', 'mariadb'):
+        rows = db.session.execute(text('EXPLAIN ' + sql)).mappings()
+        return [(row['table'], row['type'], f"type={row['type']} key={row['key']} extra={row['Extra']}")
+                for row in rows]
+
+    raise NotImplementedError(f'EXPLAIN is not supported for the {dialect.name} dialect.')
+
+
+def sqlite_step(detail):
+    """
+    Split a SQLite EXPLAIN QUERY PLAN line into (table, access, detail).
+
+    Only SCAN and SEARCH lines read a table, e.g.
+    "SEARCH tag_id USING INDEX sqlite_autoindex_tag_id_1 (tag_id=?)". The rest
+    ("MULTI-INDEX OR", "INDEX 1", "USE TEMP B-TREE FOR ORDER BY", ...) have no table.
+
+    Parameters:
+    - detail (str): The plan line.
+
+    Returns:
+    - tuple: (table, access, detail); table is None for steps that read no table.
+    """
+    words = detail.split()
+    if words[0] in ('SCAN', 'SEARCH'):
+        return words[1], words[0], detail
+    return None, detail, detail
+
+
+def is_full_scan(access):
+    """
+    Check if a plan step reads the whole table (or the whole of an index).
+
+    Parameters:
+    - access (str): Access method reported by explain().
+
+    Returns:
+    - bool: True if the step is a full scan, False otherwise.
+    """
+    return access in ('SCAN', 'ALL', 'index')
+
+
+def is_sort(detail):
+    """
+    Check if a plan step sorts rows instead of reading them in index order.
+
+    Parameters:
+    - detail (str): Plan step detail reported by explain().
+
+    Returns:
+    - bool: True for a SQLite temp B-tree or a MySQL/MariaDB filesort, False otherwise.
+    """
+    return detail.startswith('USE TEMP B-TREE') or 'Using filesort' in detail
+
+
+def check_query_plans():
+    """
+    Explain every hot query and collect the ones that regressed to a full scan or a sort.
+
+    Returns:
+    - list: (name, detail) tuples for every offending plan step; empty if all queries use their indexes.
+    """
+    regressions = []
+    for name, statement, full_scan_allowed, sort_allowed in HOT_QUERIES:
+        for table, access, detail in explain(statement):
+            if (is_full_scan(access) and not full_scan_allowed) or (is_sort(detail) and not sort_allowed):
+                regressions.append((name, detail))
+    return regressions
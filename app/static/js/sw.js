@@ -0,0 +1,111 @@
+/*!
+ * eFBi service worker
+ *
+ * Serves previously viewed contact cards and static assets straight from the
+ * cache, then revalidates them in the background against the card's ETag.
+ * Served from /sw.js so its scope covers /tag/ and /user/contact_details/.
+ */
+
+const CACHE_NAME = "efbi-v1";
+
+// Skip the background revalidation if the cached copy is younger than this
+const REVALIDATE_AFTER_MS = 60 * 1000;
+
+const PRECACHE_URLS = [
+  "/static/favicon_io/favicon.ico",
+  "/static/favicon_io/site.webmanifest",
+  "/static/favicon_io/android-chrome-192x192.png",
+];
+
+const CARD_PATHS = [/^\/tag\/[^/]+$/, /^\/user\/contact_details\/[^/]+$/];
+const CACHED_PATHS = [...CARD_PATHS, /^\/static\//];
+
+self.addEventListener("install", (event) => {
+  event.waitUntil(
+    caches
+      .open(CACHE_NAME)
+      .then((cache) => cache.addAll(PRECACHE_URLS))
+      .then(() => self.skipWaiting())
+  );
+});
+
+self.addEventListener("activate", (event) => {
+  event.waitUntil(
+    caches
+      .keys()
+      .then((names) => Promise.all(names.filter((name) => name !== CACHE_NAME).map((name) => caches.delete(name))))
+      .then(() => self.clients.claim())
+  );
+});
+
+self.addEventListener("fetch", (event) => {
+  const url = new URL(event.request.url);
+  if (
+    event.request.method !== "GET" ||
+    url.origin !== self.location.origin ||
+    !CACHED_PATHS.some((path) => path.test(url.pathname))
+  ) {
+    return;
+  }
+  event.respondWith(staleWhileRevalidate(event));
+});
+
+async function staleWhileRevalidate(event) {
+  const cache = await caches.open(CACHE_NAME);
+  const cached = await cache.match(event.request);
+
+  if (!cached) {
+    return revalidate(cache, event.request, null);
+  }
+
+  const fetchedAt = Number(cached.headers.get("X-SW-Fetched-At")) || 0;
+  if (Date.now() - fetchedAt > REVALIDATE_AFTER_MS) {
+    event.waitUntil(revalidate(cache, event.request, cached).catch(() => {}));
+  }
+  return cached;
+}
+
+async function revalidate(cache, request, cached) {
+  // Ask the server whether our copy is still current; an unchanged card costs a bodyless 304
+  const headers = new Headers();
+  const etag = cached && cached.headers.get("ETag");
+  if (etag) {
+    headers.set("If-None-Match", etag);
+  }
+
+  const response = await fetch(request.url, { headers, credentials: "same-origin", cache: "no-store" });
+
+  if (response.status === 304 && cached) {
+    await cache.put(request, await stamp(cached.clone()));
+    return cached;
+  }
+  if (response.ok && (isCard(response) || new URL(response.url).pathname.startsWith("/static/"))) {
+    const fresh = await stamp(response);
+    await cache.put(request, fresh.clone());
+    return fresh;
+  }
+
+  // No longer a card (e.g. the user was removed), so stop serving the stale copy.
+  // Server errors keep it, so a flaky connection does not empty the cache.
+  if (response.ok || response.status === 404 || response.status === 410) {
+    await cache.delete(request);
+  }
+
+  // A followed redirect (an unassigned tag leading to signup) cannot answer a navigation;
+  // let the browser fetch the original request and follow the redirect itself
+  return response.redirected ? fetch(request) : response;
+}
+
+function isCard(response) {
+  // Cards are the only pages sent with an ETag; a tap on an unassigned or invalid tag
+  // gets the signup or invalid tag page instead and is never cached
+  const path = new URL(response.url).pathname;
+  return !response.redirected && CARD_PATHS.some((cardPath) => cardPath.test(path)) && response.headers.has("ETag");
+}
+
+async function stamp(response) {
+  // Rebuild the response to record when it was last confirmed fresh
+  const headers = new Headers(response.headers);
+  headers.set("X-SW-Fetched-At", String(Date.now()));
+  return new Response(await response.blob(), { status: response.status, statusText: response.statusText, headers });
+}
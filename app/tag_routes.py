@@ -1,7 +1,10 @@
 # app/tag_routes.py
 
-from flask import Blueprint, flash, redirect, url_for, render_template
+from flask import Blueprint, flash, redirect, url_for, render_template, abort, current_app, send_file
 from app.models import TagID
+from app.qr_codes import QR_MIMETYPES, cached_qr_path, render_qr, tag_url
+from app.user_routes import render_card
+import os
 
 # Blueprint for tag-related routes
 tag_bp = Blueprint('tag', __name__, url_prefix='/tag')
@@ -20,8 +23,31 @@ def handle_tag(uuid):
         return render_template('tags/invalid_tag.html')
 
     if tag.user_id:
-        # Tag is associated with a user, redirect to their contact details
-        return redirect(url_for('user.contact_details', tag_id=tag.tag_id))
+        # Tag is associated with a user, show their contact details in this same response
+        return render_card(tag)
     else:
         # Tag is not associated with a user, redirect to sign-up page with UUID autofilled
         return redirect(url_for('user.signup', uuid=tag.tag_id))
+
+
+@tag_bp.route('/<uuid>/qr.<any(svg, png):fmt>')
+def qr_code(uuid, fmt):
+    """
+    Serve the QR code for a tag as a printable fallback for phones without NFC.
+
+    Codes are rendered once into the content-addressed cache and served from disk
+    thereafter. Tags never change, so responses are cached as immutable.
+    """
+    url = tag_url(current_app.config['TAG_BASE_URL'], uuid)
+    path = cached_qr_path(url, fmt, current_app.config['QR_CACHE_DIR'])
+
+    # Only hit the database on a cache miss, so unknown UUIDs never get rendered
+    if not os.path.exists(path):
+        if not TagID.query.filter_by(tag_id=uuid).first():
+            abort(404)
+        path = render_qr(url, fmt, current_app.config['QR_CACHE_DIR'])
+
+    response = send_file(path, mimetype=QR_MIMETYPES[fmt], max_age=31536000)
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
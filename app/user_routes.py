@@ -1,9 +1,12 @@
 # app/user_routes.py
-from flask import Blueprint, render_template, redirect, url_for, flash, request
+from flask import Blueprint, render_template, redirect, url_for, flash, request, current_app, make_response
 from flask_login import login_user, current_user, logout_user, login_required
 from app import db
 from app.models import User, TagID, ContactDetails
 from functools import wraps
+from urllib.parse import urlsplit
+import hashlib
+import os
 
 # Blueprint for user-related routes
 user_bp = Blueprint('user', __name__, url_prefix='/user')
@@ -29,18 +32,8 @@ def contact_details(tag_id):
 
     Does not require the user to be logged in.
     """
-    # Retrieve the user based on the provided username or use the logged-in user
     tag = TagID.query.filter_by(tag_id=tag_id).first()
-    user = User.query.filter_by(user_id=tag.user_id).first()
-
-    if not user:
-        flash('User not found.', 'danger')
-        return redirect(url_for('main.home'))
-
-    # Check if the user has associated contact details
-    contact_details = ContactDetails.query.filter_by(user_id=user.user_id).first()
-
-    return render_template('user/contact_details.html', user=user, contact_details=contact_details)
+    return render_card(tag)
 
 
 @user_bp.route('/signup/<uuid>')
@@ -242,3 +235,80 @@ def check_validity_email(email):
     # Check if the email is already taken
     if User.query.filter_by(email=email).first():
         flash('Email is already taken. Please choose another.', 'danger')
+
+
+def get_origin(url):
+
+    # Origin of an absolute URL (for preconnect hints), or None for relative or empty URLs
+    parts = urlsplit(url or '')
+    if parts.scheme and parts.netloc:
+        return f'{parts.scheme}://{parts.netloc}'
+    return None
+
+
+_card_template_hash = None
+
+# Columns shown on the contact card (user/contact_details.html); keep in sync with the template
+CARD_USER_FIELDS = ('first_name', 'last_name')
+CARD_CONTACT_FIELDS = ('photo_url', 'phone_number', 'address', 'description', 'linkedin_profile_url',
+                       'facebook_profile_url', 'whatsapp_profile_url')
+
+
+def get_card_etag(user, contact_details):
+
+    # Changes whenever a value shown on the card or its templates change. Built from the values
+    # themselves: updated_at only has one-second resolution, so two edits within a second would
+    # share an ETag and the service worker would keep the stale card
+    global _card_template_hash
+    if _card_template_hash is None:
+        digest = hashlib.sha1()
+        for template in ('tap_base.html', 'user/contact_details.html'):
+            with open(os.path.join(current_app.root_path, current_app.template_folder, template), 'rb') as f:
+                digest.update(f.read())
+        _card_template_hash = digest.hexdigest()
+
+    key = [_card_template_hash, [getattr(user, field) for field in CARD_USER_FIELDS],
+           [getattr(contact_details, field) for field in CARD_CONTACT_FIELDS] if contact_details else None]
+    return hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+
+
+def render_card(tag):
+
+    # Render the public contact card of a tag's user; shared with tag.handle_tag so a tap
+    # gets the card in its first response instead of after a redirect
+    user = User.query.filter_by(user_id=tag.user_id).first() if tag and tag.user_id else None
+
+    if not user:
+        flash('User not found.', 'danger')
+        return redirect(url_for('main.home'))
+
+    # Check if the user has associated contact details
+    contact_details = ContactDetails.query.filter_by(user_id=user.user_id).first()
+
+    # The service worker revalidates cached cards with If-None-Match; answer 304 without rendering
+    etag = get_card_etag(user, contact_details)
+    if etag in request.if_none_match:
+        response = make_response('', 304)
+    else:
+        photo_url = contact_details.photo_url if contact_details else None
+        response = make_response(render_template('user/contact_details.html', user=user,
+                                                 contact_details=contact_details,
+                                                 photo_origin=get_origin(photo_url)))
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
+    return response
+
+
+def render_largest_card():
+
+    # Worst case for TAP_PAGE_BYTE_BUDGET: every column filled to its maximum length
+    # (1000 characters for Text); checked by `flask check-tap-page` and the tests
+    def filled(model):
+        values = {column.name: 'x' * (getattr(column.type, 'length', None) or 1000)
+                  for column in model.__table__.columns}
+        values['photo_url'] = 'https://photos.example.com/' + 'x' * 200
+        return type(model.__name__, (), values)
+
+    contact_details = filled(ContactDetails)
+    return render_template('user/contact_details.html', user=filled(User), contact_details=contact_details,
+                           photo_origin=get_origin(contact_details.photo_url))
@@ -0,0 +1,142 @@
+# app/warmup.py
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from sqlalchemy import text
+from sqlalchemy.orm import configure_mappers
+from app import db
+
+# Pages hit by the startup benchmark: static templates, plus a tag lookup that needs the database
+BENCHMARK_URLS = ['/', '/user/login', '/admin/login', '/tag/00000000-0000-0000-0000-000000000000']
+
+# Runs in a fresh interpreter so imports are measured cold: python -c SCRIPT MODE URL...
+_BENCHMARK_SCRIPT = '''
+import json, sys, time
+started = time.perf_counter()
+from efbi import app
+imported = time.perf_counter()
+if sys.argv[1] == 'warm':
+    from app.warmup import warm_up
+    warm_up(app)
+warmed = time.perf_counter()
+client = app.test_client()
+first, second = {}, {}
+for url in sys.argv[2:]:
+    t = time.perf_counter()
+    client.get(url)
+    first[url] = (time.perf_counter() - t) * 1000
+    t = time.perf_counter()
+    client.get(url)
+    second[url] = (time.perf_counter() - t) * 1000
+print(json.dumps({'import_ms': (imported - started) * 1000, 'warm_up_ms': (warmed - imported) * 1000,
+                  'first_ms': first, 'second_ms': second}))
+'''
+
+
+def warm_up_templates(app):
+    """
+    Compile every template into the in-memory and persistent bytecode caches.
+
+    Parameters:
+    - app (Flask): Application whose templates are compiled.
+
+    Returns:
+    - int: Number of templates compiled.
+    """
+    names = app.jinja_env.list_templates(filter_func=lambda name: name.endswith('.html'))
+    for name in names:
+        app.jinja_env.get_template(name)
+    return len(names)
+
+
+def warm_up_connections(app, count):
+    """
+    Open connections into the engine's pool ahead of the first requests.
+
+    Each connection runs a trivial query and is returned to the pool, so the first
+    requests do not pay for connecting (and authenticating) to the database. A worker
+    only ever uses as many connections as it serves requests at once, so count should
+    match that (one for a gunicorn sync worker) rather than the pool size.
+
+    Parameters:
+    - app (Flask): Application whose database engine is warmed up.
+    - count (int): Number of connections to open, capped at the pool size.
+
+    Returns:
+    - int: Number of connections opened.
+    """
+    with app.app_context():
+        if hasattr(db.engine.pool, 'size'):
+            count = min(count, db.engine.pool.size())
+        connections = [db.engine.connect() for _ in range(count)]
+        for connection in connections:
+            connection.execute(text('SELECT 1'))
+            connection.close()
+    return len(connections)
+
+
+def warm_up(app, connections=None):
+    """
+    Run the warm-up phase: precompile templates, configure the ORM mappers and
+    pre-open database connections.
+
+    Connections must never be opened before gunicorn forks, since sockets cannot be
+    shared between workers; pass connections=0 when warming up the master.
+
+    Parameters:
+    - app (Flask): Application to warm up.
+    - connections (int): Connections to pre-open (default is WARM_UP_DB_CONNECTIONS).
+
+    Returns:
+    - dict: Number of templates compiled and connections opened.
+    """
+    if connections is None:
+        connections = app.config['WARM_UP_DB_CONNECTIONS']
+    templates = warm_up_templates(app)
+    configure_mappers()
+    return {'templates': templates,
+            'connections': warm_up_connections(app, connections)}
+
+
+def benchmark_startup(urls=BENCHMARK_URLS, runs=3):
+    """
+    Measure import time and first-request latency in fresh interpreters.
+
+    Three modes are measured, in order, against one temporary bytecode cache:
+    - cold: empty bytecode cache, no warm-up.
+    - cached: bytecode cache filled by the cold runs, no warm-up.
+    - warm: warm_up() before the first request.
+
+    Parameters:
+    - urls (list): Paths requested twice each after startup.
+    - runs (int): Fresh interpreters per mode; the median of each figure is reported.
+
+    Returns:
+    - dict: Per mode, median 'import_ms', 'warm_up_ms', and per URL 'first_ms' / 'second_ms'.
+    """
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    results = {}
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        env = {**os.environ, 'TEMPLATE_CACHE_DIR': cache_dir}
+        for mode in ('cold', 'cached', 'warm'):
+            samples = []
+            for run in range(runs):
+                if mode == 'cold':
+                    for name in os.listdir(cache_dir):
+                        os.remove(os.path.join(cache_dir, name))
+                output = subprocess.run([sys.executable, '-c', _BENCHMARK_SCRIPT, mode, *urls], cwd=project_root,
+                                        env=env, check=True, capture_output=True, text=True).stdout
+                samples.append(json.loads(output.strip().splitlines()[-1]))
+
+            results[mode] = {
+                'import_ms': statistics.median(sample['import_ms'] for sample in samples),
+                'warm_up_ms': statistics.median(sample['warm_up_ms'] for sample in samples),
+                'first_ms': {url: statistics.median(sample['first_ms'][url] for sample in samples) for url in urls},
+                'second_ms': {url: statistics.median(sample['second_ms'][url] for sample in samples) for url in urls},
+            }
+
+    return results
@@ -17,5 +17,35 @@ class Config:
     ADMIN_LOGIN_URL = '/admin/login'  # Update with your admin login route
     ADMIN_LOGIN_VIEW = 'admin.login'  # Update with the appropriate admin login view function
 
+    # Public base URL encoded into NFC tags and printed QR codes
+    TAG_BASE_URL = os.environ.get('TAG_BASE_URL') or 'https://efbi.net/tag/'
+
+    # Rendered QR codes are content-addressed, so this directory can be shared between workers
+    QR_CACHE_DIR = os.environ.get('QR_CACHE_DIR') or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance', 'qr_cache')
+
+    # Persistent Jinja bytecode cache, filled by `flask warm-up` and on worker start
+    TEMPLATE_CACHE_DIR = os.environ.get('TEMPLATE_CACHE_DIR') or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance', 'jinja_cache')
+
+    # Connections each process opens at warm-up; gunicorn defaults this to its --threads
+    WARM_UP_DB_CONNECTIONS = int(os.environ.get('WARM_UP_DB_CONNECTIONS') or 1)
+
+    # Largest rendered size of the public tap page; ~14 KB fits the first TCP round trip
+    TAP_PAGE_BYTE_BUDGET = 14 * 1024
+
+    # Background job worker settings
+    JOB_BATCH_SIZE = 20  # Jobs claimed per poll
+    JOB_POLL_INTERVAL = 2  # Seconds to sleep when the queue is empty
+    JOB_LOCK_TIMEOUT = 600  # Seconds before a running job is considered abandoned and reclaimed
+    JOB_TIMEOUT = 300  # Seconds a handler may run before it is interrupted; keep below JOB_LOCK_TIMEOUT
+    JOB_RETRY_BACKOFF = 30  # Seconds before the first retry; doubles on every attempt
+
+    # Sampling profiler; admins can profile a request at any time. PROFILING_ENABLED=0 is a
+    # kill switch that does not even register its hooks
+    PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED') != '0'
+    PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE') or 0)  # Fraction of requests profiled automatically
+    PROFILE_INTERVAL = 0.005  # Seconds between stack samples
+    PROFILE_DIR = os.environ.get('PROFILE_DIR') or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance', 'profiles')
+    PROFILE_MAX_PROFILES = 200  # Oldest profiles in PROFILE_DIR are deleted beyond this
+
     # Set this to True to enable debugging and auto-reload on code changes
     DEBUG = False
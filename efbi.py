@@ -1,6 +1,8 @@
 # app.py
 from app import create_app, db
 from flask_migrate import Migrate, upgrade
+import click
+import logging
 
 app = create_app()
 migrate = Migrate(app, db)
@@ -13,3 +15,120 @@ def deploy():
     with app.app_context():
         # Migrate database to latest revision
         upgrade()
+
+
+@app.cli.command('warm-up')
+def warm_up():
+    """Precompile templates and pre-open database connections."""
+    from app.warmup import warm_up
+
+    counts = warm_up(app)
+    click.echo(f'Compiled {counts["templates"]} templates, opened {counts["connections"]} connections.')
+
+
+@app.cli.command('benchmark-startup')
+@click.option('--runs', type=int, default=3, help='Fresh interpreters per mode.')
+def benchmark_startup(runs):
+    """Measure import time and first-request latency, cold and warmed up."""
+    from app.warmup import benchmark_startup
+
+    for mode, result in benchmark_startup(runs=runs).items():
+        click.echo(f'{mode}: import {result["import_ms"]:.0f} ms, warm-up {result["warm_up_ms"]:.0f} ms')
+        for url, first_ms in result['first_ms'].items():
+            click.echo(f'  {url:<50} first {first_ms:7.1f} ms   second {result["second_ms"][url]:6.1f} ms')
+
+
+@app.cli.command('run-worker')
+@click.option('--once', is_flag=True, help='Exit when no runnable jobs are left.')
+def run_worker(once):
+    """Run queued background jobs."""
+    from app.jobs import work
+
+    app.logger.setLevel(logging.INFO)
+    with app.app_context():
+        work(once=once)
+
+
+@app.cli.command('check-query-plans')
+def check_query_plans():
+    """Fail if a hot query regresses to a full table scan or a sort."""
+    from app.query_plans import check_query_plans
+
+    with app.app_context():
+        regressions = check_query_plans()
+
+    for name, detail in regressions:
+        click.echo(f'REGRESSION  {name}: {detail}', err=True)
+    if regressions:
+        raise SystemExit(1)
+    click.echo(f'{db.engine.dialect.name}: all hot queries use their indexes.')
+
+
+@app.cli.command('check-tap-page')
+def check_tap_page():
+    """Fail if the public tap page renders over its byte budget."""
+    from app.user_routes import render_largest_card
+
+    with app.test_request_context():
+        page = render_largest_card()
+
+    size, budget = len(page.encode('utf-8')), app.config['TAP_PAGE_BYTE_BUDGET']
+    if size > budget:
+        click.echo(f'Tap page is {size} bytes, over the {budget} byte budget.', err=True)
+        raise SystemExit(1)
+    click.echo(f'Tap page is {size} bytes ({budget} byte budget).')
+
+
+@app.cli.command('render-qr-sheets')
+@click.argument('output_dir')
+@click.option('--unassigned-only', is_flag=True, help='Only print tags not yet linked to a user.')
+@click.option('--processes', type=int, default=None, help='Worker processes (default: CPU count).')
+def render_qr_sheets(output_dir, unassigned_only, processes):
+    """Render tag QR codes into print-ready sheets."""
+    from app.models import TagID
+    from app.qr_codes import render_sheets
+
+    with app.app_context():
+        query = db.select(TagID.tag_id).order_by(TagID.generated_at)
+        if unassigned_only:
+            query = query.filter(TagID.user_id.is_(None))
+        tag_ids = list(db.session.scalars(query))
+
+    sheets = render_sheets(tag_ids, app.config['TAG_BASE_URL'], output_dir,
+                           app.config['QR_CACHE_DIR'], processes=processes)
+    click.echo(f'Rendered {len(tag_ids)} tags onto {len(sheets)} sheets in {output_dir}.')
+
+
+@app.cli.command('encode-ndef')
+@click.argument('output')
+@click.option('--tag', 'tag_ids', multiple=True, help='Tag ID to encode; repeat for a list.')
+@click.option('--offset', type=int, default=0, help='Skip this many tags, oldest first.')
+@click.option('--limit', type=int, default=None, help='Encode at most this many tags.')
+@click.option('--unassigned-only', is_flag=True, help='Only encode tags not yet linked to a user.')
+def encode_ndef(output, tag_ids, offset, limit, unassigned_only):
+    """Write NDEF URI records for a range or list of tags."""
+    from app.models import TagID
+    from app.ndef import write_ndef_batch
+    from app.qr_codes import tag_url
+
+    if tag_ids and (offset or limit is not None or unassigned_only):
+        raise click.UsageError('--tag cannot be combined with --offset, --limit or --unassigned-only.')
+
+    with app.app_context():
+        if tag_ids:
+            known = set(db.session.scalars(db.select(TagID.tag_id).filter(TagID.tag_id.in_(tag_ids))))
+        else:
+            query = db.select(TagID.tag_id).order_by(TagID.generated_at, TagID.tag_id)
+            if unassigned_only:
+                query = query.filter(TagID.user_id.is_(None))
+            found = list(db.session.scalars(query.offset(offset).limit(limit)))
+
+    if tag_ids:
+        # Keep the order the tags were given in
+        missing = set(tag_ids) - known
+        if missing:
+            raise click.BadParameter(f'Unknown tag IDs: {", ".join(sorted(missing))}', param_hint='--tag')
+        found = list(tag_ids)
+
+    index = write_ndef_batch([(tag_id, tag_url(app.config['TAG_BASE_URL'], tag_id)) for tag_id in found], output)
+    click.echo(f'Wrote {index["count"]} records of {index["stride"]} bytes to {output}.')
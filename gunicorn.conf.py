@@ -0,0 +1,24 @@
+# gunicorn.conf.py
+import os
+
+# Load the app once in the master so workers share its memory copy-on-write.
+# Set GUNICORN_PRELOAD=0 to load it in every worker instead.
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') != '0'
+
+
+def when_ready(server):
+    # With preload, compile the templates once in the master; workers inherit them on fork
+    if server.cfg.preload_app:
+        from app.warmup import warm_up
+        warm_up(server.app.wsgi(), connections=0)
+
+
+def post_worker_init(worker):
+    from app import db
+    from app.warmup import warm_up
+
+    # Never reuse connections inherited from the master, then open one connection per
+    # request thread (one for sync workers) unless WARM_UP_DB_CONNECTIONS says otherwise
+    with worker.wsgi.app_context():
+        db.engine.dispose(close=False)
+    warm_up(worker.wsgi, connections=int(os.environ.get('WARM_UP_DB_CONNECTIONS') or worker.cfg.threads))
@@ -0,0 +1,35 @@
+"""drop redundant user constraint, index tag generated_at
+
+Revision ID: 9c2e51a7d3f0
+Revises: 4d8bfa25bbbe
+Create Date: 2026-10-19 10:12:31.504118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c2e51a7d3f0'
+down_revision = '4d8bfa25bbbe'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # user_id is the primary key and email/username already have their own
+    # unique indexes, so the composite constraint only costs writes.
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_constraint('unique_user_email', type_='unique')
+
+    # The admin dashboard lists tags newest first.
+    with op.batch_alter_table('tag_id', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_tag_id_generated_at'), ['generated_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('tag_id', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_tag_id_generated_at'))
+
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.create_unique_constraint('unique_user_email', ['user_id', 'email', 'username'])
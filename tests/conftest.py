@@ -0,0 +1,22 @@
+# tests/conftest.py
+import os
+import pytest
+
+
+@pytest.fixture(scope='session')
+def app(tmp_path_factory):
+    """
+    Application backed by a fresh SQLite database built with create_all().
+    """
+    # config.Config reads the environment when it is first imported, by create_app()
+    tmp_path = tmp_path_factory.mktemp('efbi')
+    os.environ['JAWSDB_MARIA_URL'] = f"sqlite:///{tmp_path / 'efbi.db'}"
+    os.environ['TEMPLATE_CACHE_DIR'] = str(tmp_path / 'jinja_cache')
+    os.environ['PROFILING_ENABLED'] = '0'
+
+    from app import create_app, db
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        yield app
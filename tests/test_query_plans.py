@@ -0,0 +1,21 @@
+# tests/test_query_plans.py
+from sqlalchemy import text
+from app import db
+from app.query_plans import check_query_plans
+
+
+def test_hot_queries_use_their_indexes(app):
+    assert check_query_plans() == []
+
+
+def test_dropping_the_dashboard_index_is_a_regression(app):
+    db.session.execute(text('DROP INDEX ix_tag_id_generated_at'))
+    db.session.commit()
+    # SQLite connections cache prepared statements (and their plans) across schema changes
+    db.engine.dispose()
+    try:
+        assert [name for name, _ in check_query_plans()] == ['admin.dashboard: tags newest first']
+    finally:
+        db.session.execute(text('CREATE INDEX ix_tag_id_generated_at ON tag_id (generated_at)'))
+        db.session.commit()
+        db.engine.dispose()
@@ -0,0 +1,8 @@
+# tests/test_tap_page.py
+from app.user_routes import render_largest_card
+
+
+def test_largest_card_fits_the_byte_budget(app):
+    with app.test_request_context():
+        page = render_largest_card()
+    assert len(page.encode('utf-8')) <= app.config['TAP_PAGE_BYTE_BUDGET']